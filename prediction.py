@@ -4,8 +4,8 @@
 #
 # Description:    This script loads monthly greenhouse gas data from a public URL,
 #                 cleans it, and then iterates through each specified gas. For each 
-#                 gas, it performs a grid search to find the optimal SARIMA 
-#                 parameters based on the AIC. It then fits the model, generates a 
+#                 gas, it performs a stepwise (or optional grid) search to find the
+#                 optimal SARIMA parameters based on the AIC. It then fits the model, generates a 
 #                 6-month forecast with a 95% confidence interval, and saves all 
 #                 forecasts to a CSV file. Finally, it produces a single interactive 
 #                 HTML dot chart using Plotly, allowing for easy comparison and 
@@ -17,6 +17,8 @@
 #                 - HTML: "index.html" (interactive plot)
 #
 # Models Used:    - statsmodels.tsa.statespace.SARIMAX
+#                 - Numba-compiled conditional sum of squares (grid search ranking)
+#                 - pmdarima.auto_arima (stepwise order selection)
 #
 # Author:         Alberth Nahas (alberth.nahas@bmkg.go.id)
 # Created Date:   2025-07-22
@@ -26,10 +28,29 @@
 import pandas as pd
 import warnings
 from statsmodels.tsa.statespace.sarimax import SARIMAX
+from statsmodels.tsa.stattools import acf, pacf
+from scipy.optimize import minimize
+from scipy.stats import norm
+from numba import njit
 import itertools
+import numpy as np
+import scipy
+import statsmodels
+import pmdarima
+from joblib import Memory, Parallel, delayed
+from threadpoolctl import threadpool_limits
+from pmdarima import ARIMA, auto_arima
+from pmdarima.arima import ndiffs, nsdiffs
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+import pyarrow as pa
+import pyarrow.csv as pacsv
 import base64
+import hashlib
+import inspect
+import os
+import time
+import urllib.request
 
 # Suppress warnings for cleaner output
 warnings.filterwarnings("ignore")
@@ -38,107 +59,406 @@ warnings.filterwarnings("ignore")
 # URL for the public Google Sheet CSV
 url = 'https://docs.google.com/spreadsheets/d/e/2PACX-1vRjhwQGnOCm51KTrr-xAgLjm1CwIyE9OzSB4WsP8xEvn6YpACXp36ikIMnwqZ2Fyw/pub?gid=1720832544&single=true&output=csv'
 
-# Load the dataset, treating '#N/A' as missing values
+# Local copy of the sheet, refreshed when older than a day (the data are monthly)
+data_cache_path = '.ghg_cache.csv'
+data_cache_max_age = 24 * 60 * 60  # seconds
+
+# Define the target gases we will be working with
+target_gases = ['CO2_seasonal', 'CH4_seasonal', 'N2O_seasonal', 'SF6_seasonal']
+
+# Load only the columns we need with explicit types, treating '#N/A' as missing values.
+# Concentrations fit comfortably in float32; SARIMAX still computes in float64 internally.
+if (not os.path.exists(data_cache_path)
+        or time.time() - os.path.getmtime(data_cache_path) > data_cache_max_age):
+    try:
+        # Download to a temporary file first so a failed fetch never leaves a partial cache
+        urllib.request.urlretrieve(url, data_cache_path + '.tmp')
+        os.replace(data_cache_path + '.tmp', data_cache_path)
+    except Exception as e:
+        if not os.path.exists(data_cache_path):
+            print(f"❌ Error loading data: {e}")
+            exit()
+        # Fall back to the stale local copy rather than giving up
+        print(f"⚠️ Could not refresh data ({e}); using the cached copy instead.")
+
 try:
-    df = pd.read_csv(url, na_values='#N/A')
+    df = pd.read_csv(data_cache_path, na_values='#N/A', memory_map=True, engine='c',
+                     usecols=['Date'] + target_gases,
+                     dtype={gas: 'float32' for gas in target_gases},
+                     parse_dates=['Date'], date_format='%b-%Y')
     print("✅ Data loaded successfully.")
 except Exception as e:
     print(f"❌ Error loading data: {e}")
     exit()
 
-# Convert 'Date' column to datetime objects using the correct format
-df['Date'] = pd.to_datetime(df['Date'], format='%b-%Y')
-
 # Set Date as the index first
 df.set_index('Date', inplace=True)
 df.sort_index(inplace=True)
 
-# Define the target gases we will be working with
-target_gases = ['CO2_seasonal', 'CH4_seasonal', 'N2O_seasonal', 'SF6_seasonal']
-
-# Create a subset with only the seasonal columns we need
-df_seasonal = df[target_gases].copy()
-
 # Drop rows where ANY of the seasonal columns have missing values
-df_seasonal.dropna(inplace=True)
-
-# Use the cleaned seasonal data for the rest of the analysis
-df = df_seasonal
+df.dropna(inplace=True)
 
 # --- 2. SARIMA Forecasting for Each Gas ---
 forecast_horizon = 6  # Next 6 months
-all_forecasts = []
+
+def difference(y, d_order, sD_order, seasonality):
+    """
+    Applies d regular and D seasonal differences to a 1-D array.
+    """
+    diffed = np.asarray(y, dtype=float)
+    for _ in range(d_order):
+        diffed = np.diff(diffed)
+    for _ in range(sD_order):
+        diffed = diffed[seasonality:] - diffed[:-seasonality]
+    return diffed
+
+@njit(cache=True, fastmath={'reassoc', 'contract'})
+def css_loglik(y, phi, theta, seasonal_phi, seasonal_theta, s, t0):
+    """
+    Conditional sum-of-squares log-likelihood of a multiplicative seasonal ARMA
+    model on an already differenced series, scored over observations t0 onwards.
+    """
+    # Expand (1 - phi(L))(1 - Phi(L^s)) and (1 + theta(L))(1 + Theta(L^s)) into full lag polynomials
+    ar_poly = np.zeros(phi.shape[0] + seasonal_phi.shape[0] * s + 1)
+    for i in range(phi.shape[0] + 1):
+        ci = 1.0 if i == 0 else -phi[i - 1]
+        for j in range(seasonal_phi.shape[0] + 1):
+            cj = 1.0 if j == 0 else -seasonal_phi[j - 1]
+            ar_poly[i + j * s] += ci * cj
+    ma_poly = np.zeros(theta.shape[0] + seasonal_theta.shape[0] * s + 1)
+    for i in range(theta.shape[0] + 1):
+        ci = 1.0 if i == 0 else theta[i - 1]
+        for j in range(seasonal_theta.shape[0] + 1):
+            cj = 1.0 if j == 0 else seasonal_theta[j - 1]
+            ma_poly[i + j * s] += ci * cj
+    
+    # e_t = y_t + sum(ar_k * y_{t-k}) - sum(ma_k * e_{t-k}), with errors before t0 set to zero.
+    # Starting every candidate at the same t0 makes their likelihoods comparable, and a model
+    # padded with zero coefficients reproduces its sub-model exactly.
+    n_ar = ar_poly.shape[0] - 1
+    n_ma = ma_poly.shape[0] - 1
+    n_obs = y.shape[0]
+    resid = np.zeros(n_obs)
+    sse = 0.0
+    for t in range(t0, n_obs):
+        e = y[t]
+        for k in range(1, n_ar + 1):
+            e += ar_poly[k] * y[t - k]
+        for k in range(1, min(n_ma, t) + 1):
+            e -= ma_poly[k] * resid[t - k]
+        resid[t] = e
+        sse += e * e
+    
+    n_used = n_obs - t0
+    return -0.5 * n_used * (np.log(2 * np.pi * sse / n_used) + 1)
+
+# Fitted candidates are cached on disk so re-runs skip fits already done. joblib only
+# fingerprints the decorated function's own source, so the cache location is also keyed
+# on the helpers it calls and on the fitting libraries' versions; entries from older
+# code or library versions are then simply ignored (delete .sarima_cache to reclaim space).
+cache_key = hashlib.sha1(''.join([
+    inspect.getsource(difference),
+    inspect.getsource(css_loglik.py_func),
+    np.__version__, scipy.__version__, statsmodels.__version__, pmdarima.__version__,
+]).encode()).hexdigest()[:12]
+memory = Memory(os.path.join('.sarima_cache', cache_key), verbose=0)
+
+@memory.cache
+def fit_css(ts_values, order, seasonal_order, t0, start_params=None):
+    """
+    Fits a single SARIMA candidate on a tuple of observations by conditional
+    sum of squares over the window starting at t0 (which must be at least the
+    candidate's AR lag) and returns its AIC and fitted parameters. The search
+    starts from zeros unless ARMA start_params are given.
+    """
+    warnings.filterwarnings("ignore")
+    p_order, d_order, q_order = order
+    sP_order, sD_order, sQ_order, seasonality = seasonal_order
+    y = difference(ts_values, d_order, sD_order, seasonality)
+    splits = np.cumsum([p_order, q_order, sP_order])
+    
+    def neg_loglik(params):
+        phi, theta, seasonal_phi, seasonal_theta = np.split(params, splits)
+        return -css_loglik(y, phi, theta, seasonal_phi, seasonal_theta, seasonality, t0)
+    
+    # Nelder-Mead on the CSS objective ranks candidates; the winner is refit with
+    # full MLE before forecasting. scipy's default simplex around zero is tiny
+    # (0.00025 per coordinate) and stalls far from the optimum, so use steps of 0.1
+    # and restart from the result until the objective stops improving.
+    n_params = p_order + q_order + sP_order + sQ_order
+    params = np.zeros(n_params) if start_params is None else np.asarray(start_params, dtype=float)
+    best = neg_loglik(params)
+    for _ in range(10) if n_params else ():
+        simplex = np.vstack([params, params + 0.1 * np.eye(n_params)])
+        result = minimize(neg_loglik, params, method='Nelder-Mead',
+                          options=dict(initial_simplex=simplex))
+        improvement = best - result.fun
+        params, best = result.x, result.fun
+        if improvement < 1e-6:
+            break
+    loglik = -best
+    
+    # Recover sigma2 from the concentrated likelihood: loglik = -n/2 * (log(2*pi*sigma2) + 1)
+    n_used = len(y) - t0
+    sigma2 = np.exp(-2 * loglik / n_used - 1) / (2 * np.pi)
+    aic = -2 * loglik + 2 * (params.size + 1)
+    return aic, np.r_[params, sigma2]
+
+def _fit_one(ts_data, order, seasonal_order, t0, start_params=None):
+    """
+    Fits a single SARIMA candidate and returns its AIC together with the orders
+    and fitted parameters.
+    """
+    # loky workers are fresh processes, so warnings must be suppressed again here.
+    # Parallelism comes from the worker processes, so keep BLAS single-threaded
+    # for the duration of the fit to avoid oversubscribing the cores.
+    warnings.filterwarnings("ignore")
+    with threadpool_limits(limits=1, user_api='blas'):
+        try:
+            aic, params = fit_css(tuple(ts_data.values), order, seasonal_order, t0, start_params)
+            if np.isnan(aic):
+                return float('inf'), None, None, None
+            return aic, order, seasonal_order, params
+        except:
+            return float('inf'), None, None, None
 
 def optimize_sarima(ts_data, p_range, d_range, q_range, sP_range, sD_range, sQ_range, seasonality):
     """
     Performs a grid search to find the best SARIMA parameters based on AIC.
+    Every candidate is fitted independently, so the grid is evaluated in parallel.
     """
-    best_aic = float('inf')
-    best_order = None
-    best_seasonal_order = None
+    # Screen the differenced series once per (d, D): AR/MA terms whose lag shows
+    # almost no (partial) autocorrelation are unlikely to improve the AIC
+    acf_threshold = 0.1
+    correlations = {}
+    for d_order, sD_order in itertools.product(d_range, sD_range):
+        diffed = difference(ts_data, d_order, sD_order, seasonality)
+        correlations[(d_order, sD_order)] = (acf(diffed, nlags=seasonality + 1),
+                                             pacf(diffed, nlags=seasonality + 1))
     
-    param_combinations = list(itertools.product(p_range, d_range, q_range))
-    seasonal_param_combinations = list(itertools.product(sP_range, sD_range, sQ_range))
+    combos = []
+    for p_, d_, q_, P_, D_, Q_ in itertools.product(p_range, d_range, q_range,
+                                                    sP_range, sD_range, sQ_range):
+        acf_vals, pacf_vals = correlations[(d_, D_)]
+        if p_ > 0 and abs(pacf_vals[1]) < acf_threshold:
+            continue
+        if q_ > 0 and abs(acf_vals[1]) < acf_threshold:
+            continue
+        if (P_ > 0 or Q_ > 0) and abs(acf_vals[seasonality]) < acf_threshold:
+            continue
+        combos.append(((p_, d_, q_), (P_, D_, Q_, seasonality)))
     
-    for order in param_combinations:
-        for seasonal_order_parts in seasonal_param_combinations:
-            seasonal_order = seasonal_order_parts + (seasonality,)
-            try:
-                model = SARIMAX(ts_data,
-                                order=order,
-                                seasonal_order=seasonal_order,
-                                enforce_stationarity=False,
-                                enforce_invertibility=False)
-                results = model.fit(disp=False)
-                
-                if results.aic < best_aic:
-                    best_aic = results.aic
-                    best_order = order
-                    best_seasonal_order = seasonal_order
-            except:
+    # Score every candidate on the same window, starting after the longest AR lag in the grid
+    t0 = max(p_range) + max(sP_range) * seasonality
+    
+    results = Parallel(n_jobs=-1, backend="loky")(
+        delayed(_fit_one)(ts_data, order, seasonal_order, t0) for order, seasonal_order in combos
+    )
+    results = _enforce_nesting(ts_data, combos, results, t0)
+    best_aic, best_order, best_seasonal_order, best_params = min(results, key=lambda r: r[0])
+    if best_params is not None:
+        best_params = pd.Series(best_params, index=sarima_param_names(best_order, best_seasonal_order))
+    return best_order, best_seasonal_order, best_params
+
+def sarima_param_names(order, seasonal_order):
+    """
+    Returns the SARIMAX parameter names of an intercept-free SARIMA model.
+    """
+    seasonality = seasonal_order[3]
+    return ([f'ar.L{i}' for i in range(1, order[0] + 1)]
+            + [f'ma.L{i}' for i in range(1, order[2] + 1)]
+            + [f'ar.S.L{i * seasonality}' for i in range(1, seasonal_order[0] + 1)]
+            + [f'ma.S.L{i * seasonality}' for i in range(1, seasonal_order[2] + 1)]
+            + ['sigma2'])
+
+def _enforce_nesting(ts_data, combos, results, t0):
+    """
+    Makes sure no candidate has a lower CSS likelihood than a sub-model it nests
+    (fewer terms, same differencing), refitting it from that sub-model if needed.
+    """
+    # Walk candidates from fewest to most terms so every sub-model is settled first
+    n_terms = lambda combo: combo[0][0] + combo[0][2] + combo[1][0] + combo[1][2]
+    loglik = lambda combo, aic: n_terms(combo) + 1 - aic / 2
+    fitted = {}
+    for i in sorted(range(len(combos)), key=lambda i: n_terms(combos[i])):
+        (p_, d_, q_), (P_, D_, Q_, seasonality) = combos[i]
+        aic, _, _, params = results[i]
+        best_sub = None
+        for (sub_order, sub_seasonal), (sub_aic, _, _, sub_params) in fitted.items():
+            if sub_params is None or (sub_order[1], sub_seasonal[1]) != (d_, D_):
                 continue
-    return best_order, best_seasonal_order
+            if (sub_order, sub_seasonal) == combos[i]:
+                continue
+            if not (sub_order[0] <= p_ and sub_order[2] <= q_
+                    and sub_seasonal[0] <= P_ and sub_seasonal[2] <= Q_):
+                continue
+            sub_loglik = loglik((sub_order, sub_seasonal), sub_aic)
+            if best_sub is None or sub_loglik > best_sub[0]:
+                best_sub = (sub_loglik, sub_order, sub_seasonal, sub_params)
+        
+        if best_sub is not None and (params is None or best_sub[0] > loglik(combos[i], aic) + 1e-6):
+            # Embed the sub-model's coefficients, padding the extra lags with zeros
+            sub_loglik, sub_order, sub_seasonal, sub_params = best_sub
+            phi, theta, seasonal_phi, seasonal_theta = np.split(
+                sub_params[:-1], np.cumsum([sub_order[0], sub_order[2], sub_seasonal[0]])
+            )
+            start_params = np.r_[np.pad(phi, (0, p_ - len(phi))),
+                                 np.pad(theta, (0, q_ - len(theta))),
+                                 np.pad(seasonal_phi, (0, P_ - len(seasonal_phi))),
+                                 np.pad(seasonal_theta, (0, Q_ - len(seasonal_theta)))]
+            results[i] = _fit_one(ts_data, combos[i][0], combos[i][1], t0, start_params)
+        fitted[combos[i]] = results[i]
+    return results
+
+@memory.cache
+def optimize_sarima_stepwise(ts_data, d_order, sD_order, seasonality):
+    """
+    Finds the best SARIMA parameters based on AIC with the Hyndman-Khandakar
+    stepwise search, visiting only a handful of neighbouring candidates.
+    """
+    # Same bounds as the grid search. with_intercept=False only sets the starting model:
+    # the stepwise solver also toggles a constant, so the selection may compare
+    # models with a mean term
+    model = auto_arima(ts_data,
+                       seasonal=True, m=seasonality,
+                       start_p=1, start_q=1, max_p=1, max_q=1, max_P=1, max_Q=1,
+                       d=d_order, D=sD_order,
+                       with_intercept=False,
+                       stepwise=True,
+                       suppress_warnings=True,
+                       error_action="ignore",
+                       information_criterion="aic")
+    if model.with_intercept:
+        # Refit the chosen orders without the constant to match the SARIMAX refit
+        model = ARIMA(model.order, model.seasonal_order,
+                      with_intercept=False, suppress_warnings=True).fit(ts_data)
+    return (model.order, model.seasonal_order,
+            pd.Series(model.params(), index=model.arima_res_.model.param_names))
+
+def sarima_forecast(sarima_result, steps, alpha=0.05):
+    """
+    Computes the forecast mean and (1 - alpha) confidence bounds of a fitted
+    SARIMA model by propagating its last predicted state and state covariance
+    through the Kalman prediction recursion (P = T P T' + R Q R').
+    """
+    # Use the fitted system matrices; the model object's own matrices change on any later update
+    filter_results = sarima_result.filter_results
+    design = filter_results.design[:, :, 0]
+    obs_cov = filter_results.obs_cov[:, :, 0]
+    transition = filter_results.transition[:, :, 0]
+    selection = filter_results.selection[:, :, 0]
+    state_noise_cov = selection @ filter_results.state_cov[:, :, 0] @ selection.T
+    
+    # Propagate the last predicted state and its covariance: a = T a, P = T P T' + R Q R'
+    state = sarima_result.predicted_state[:, -1]
+    state_cov = sarima_result.predicted_state_cov[:, :, -1]
+    mean = np.empty(steps)
+    variance = np.empty(steps)
+    for h in range(steps):
+        mean[h] = (design @ state)[0]
+        variance[h] = (design @ state_cov @ design.T + obs_cov)[0, 0]
+        state = transition @ state
+        state_cov = transition @ state_cov @ transition.T + state_noise_cov
+    
+    std_err = np.sqrt(variance)
+    z = norm.ppf(1 - alpha / 2)
+    return mean, mean - z * std_err, mean + z * std_err
+
+def forecast_gas(gas, ts):
+    """
+    Selects the best SARIMA model for one gas and returns its forecast dates,
+    mean and 95% confidence bounds as NumPy arrays.
+    """
+    warnings.filterwarnings("ignore")
+    with threadpool_limits(limits=1, user_api='blas'):
+        print(f"\n🔄 Memproses: {gas}")
+
+        # Fix the differencing orders once with unit-root tests (ADF and OCSB)
+        # instead of searching over every (d, D) combination
+        d_order = ndiffs(ts, test='adf', max_d=max(d))
+        sD_order = nsdiffs(ts, m=s, test='ocsb', max_D=max(D))
+
+        if search_method == 'stepwise':
+            best_order, best_seasonal_order, best_params = optimize_sarima_stepwise(ts, d_order, sD_order, s)
+        else:
+            best_order, best_seasonal_order, best_params = optimize_sarima(
+                ts, p, [d_order], q, P, [sD_order], Q, s
+            )
+
+        sarima_model = SARIMAX(ts,
+                               order=best_order,
+                               seasonal_order=best_seasonal_order,
+                               enforce_stationarity=False,
+                               enforce_invertibility=False)
+        # Warm-start from the search winner's parameters, matched by name; if the optimizer
+        # fails to converge from there, also try a cold fit and keep the better likelihood
+        start_params = None
+        if best_params is not None:
+            start_params = best_params.reindex(sarima_model.param_names)
+            if start_params.isna().any():
+                start_params = None
+        sarima_result = sarima_model.fit(disp=False, start_params=start_params)
+        if not sarima_result.mle_retvals['converged']:
+            cold_result = sarima_model.fit(disp=False)
+            if np.isfinite(cold_result.llf) and not cold_result.llf <= sarima_result.llf:
+                sarima_result = cold_result
+
+        forecast_mean, forecast_lower, forecast_upper = sarima_forecast(sarima_result, forecast_horizon)
+
+        last_data_date = ts.index.max()
+        forecast_start_date = last_data_date + pd.DateOffset(months=1)
+        forecast_dates = pd.date_range(start=forecast_start_date, periods=forecast_horizon, freq='MS')
+
+        return forecast_dates.values, forecast_mean, forecast_lower, forecast_upper
 
 # --- Loop through each gas and perform forecasting ---
 print(f"\n--- Memulai Prediksi SARIMA ---")
 p = d = q = range(0, 2)
 P = D = Q = range(0, 2)
 s = 12
+search_method = 'stepwise'  # 'stepwise' (auto_arima) or 'grid' (exhaustive search)
+
+# Parallelize one level only: the grid search already spreads its candidate fits
+# over all cores, so gases then run one after another; the stepwise search is
+# sequential, so the gases themselves run in parallel
+gas_n_jobs = 1 if search_method == 'grid' else -1
+all_forecasts = Parallel(n_jobs=gas_n_jobs, backend="loky")(
+    delayed(forecast_gas)(gas, df[gas]) for gas in target_gases
+)
 
-for gas in target_gases:
-    print(f"\n🔄 Memproses: {gas}")
-    ts = df[gas]
-    
-    best_order, best_seasonal_order = optimize_sarima(ts, p, d, q, P, D, Q, s)
-    
-    sarima_model = SARIMAX(ts,
-                           order=best_order,
-                           seasonal_order=best_seasonal_order,
-                           enforce_stationarity=False,
-                           enforce_invertibility=False)
-    sarima_result = sarima_model.fit(disp=False)
-    
-    forecast = sarima_result.get_forecast(steps=forecast_horizon)
-    forecast_mean = forecast.predicted_mean
-    forecast_ci = forecast.conf_int()
-    
-    last_data_date = ts.index.max()
-    forecast_start_date = last_data_date + pd.DateOffset(months=1)
-    forecast_dates = pd.date_range(start=forecast_start_date, periods=forecast_horizon, freq='MS')
-    
-    forecast_df = pd.DataFrame({
-        'Gas': gas,
-        'Date': forecast_dates,
-        'Forecast': forecast_mean.values,
-        'Lower_CI': forecast_ci.iloc[:, 0].values,
-        'Upper_CI': forecast_ci.iloc[:, 1].values
-    })
-    
-    all_forecasts.append(forecast_df)
-
-final_forecast_df = pd.concat(all_forecasts, ignore_index=True)
+# Fill column buffers per gas and build the forecast table in a single step
+n_rows = len(target_gases) * forecast_horizon
+gas_col = np.empty(n_rows, dtype=object)
+date_col = np.empty(n_rows, dtype='datetime64[ns]')
+# float32 is ample for concentrations with < 6 significant digits and halves the output size
+forecast_col = np.empty(n_rows, dtype=np.float32)
+lower_col = np.empty(n_rows, dtype=np.float32)
+upper_col = np.empty(n_rows, dtype=np.float32)
+
+for i, (gas, (dates, mean, lower, upper)) in enumerate(zip(target_gases, all_forecasts)):
+    rows = slice(i * forecast_horizon, (i + 1) * forecast_horizon)
+    gas_col[rows] = gas
+    date_col[rows] = dates
+    forecast_col[rows] = mean
+    lower_col[rows] = lower
+    upper_col[rows] = upper
+
+final_forecast_df = pd.DataFrame({
+    'Gas': gas_col,
+    'Date': date_col,
+    'Forecast': forecast_col,
+    'Lower_CI': lower_col,
+    'Upper_CI': upper_col
+})
 output_csv_path = "ghg_sarima_forecasts_next_6_months.csv"
-final_forecast_df.to_csv(output_csv_path, index=False)
+# Write through PyArrow's C++ CSV writer; Date is stored as a calendar date
+# and nothing is quoted so the file matches the previous pandas output
+forecast_table = pa.Table.from_pandas(final_forecast_df, preserve_index=False)
+forecast_table = forecast_table.set_column(
+    forecast_table.schema.get_field_index('Date'), 'Date', forecast_table['Date'].cast(pa.date32())
+)
+pacsv.write_csv(forecast_table, output_csv_path,
+                write_options=pacsv.WriteOptions(quoting_style='none', quoting_header='none'))
 print(f"\n✅ Semua prediksi disimpan ke: {output_csv_path}")
 
 # --- 3. Create Interactive 2x2 Panel Chart using HTML ---
@@ -167,42 +487,54 @@ fig = make_subplots(
     horizontal_spacing=0.10
 )
 
-# Filter historical data
+# Filter historical data (label slicing on the sorted DatetimeIndex is a binary search)
 last_12_months_start = df.index.max() - pd.DateOffset(months=11)
-historical_filtered = df[df.index >= last_12_months_start]
+historical_filtered = df.loc[last_12_months_start:]
 
 # Define subplot positions
 subplot_positions = [(1, 1), (1, 2), (2, 1), (2, 2)]
 
+# Split the forecasts by gas in a single pass
+forecasts_by_gas = dict(list(final_forecast_df.groupby('Gas', sort=False)))
+
+# Collect every trace first and add them to the figure in one batched call
+traces, trace_rows, trace_cols = [], [], []
+
 for i, gas in enumerate(target_gases):
     row, col = subplot_positions[i]
     gas_name = gas_names_id[gas]
     color = gas_colors[gas]
     
     # Historical Data
-    fig.add_trace(go.Scatter(
+    traces.append(go.Scatter(
         x=historical_filtered.index, y=historical_filtered[gas], mode='lines+markers',
         name=f'Data Historis {gas_name}', marker=dict(size=4, color=color), line=dict(color=color, width=2),
         showlegend=True, legendgroup=f'group{i}',
         hovertemplate=f'<b>{gas_name} Historis</b><br>Tanggal: %{{x|%b %Y}}<br>Konsentrasi: %{{y:.2f}} {gas_units[gas]}<extra></extra>'
-    ), row=row, col=col)
+    ))
     
     # Forecast Data
-    gas_forecast = final_forecast_df[final_forecast_df['Gas'] == gas]
-    fig.add_trace(go.Scatter(
+    gas_forecast = forecasts_by_gas[gas]
+    traces.append(go.Scatter(
         x=gas_forecast['Date'], y=gas_forecast['Forecast'], mode='lines+markers',
         name=f'Prediksi {gas_name}', marker=dict(size=6, symbol='star', color=color), line=dict(color=color, width=3, dash='dot'),
         showlegend=True, legendgroup=f'group{i}',
         hovertemplate=f'<b>{gas_name} Prediksi</b><br>Tanggal: %{{x|%b %Y}}<br>Konsentrasi: %{{y:.2f}} {gas_units[gas]}<extra></extra>'
-    ), row=row, col=col)
+    ))
 
-    # Confidence Interval
-    fig.add_trace(go.Scatter(
-        x=pd.concat([gas_forecast['Date'], gas_forecast['Date'][::-1]]),
-        y=pd.concat([gas_forecast['Upper_CI'], gas_forecast['Lower_CI'][::-1]]),
+    # Confidence Interval (band outline: upper bound forward, lower bound backward)
+    gas_dates = gas_forecast['Date'].to_numpy()
+    traces.append(go.Scatter(
+        x=np.concatenate([gas_dates, gas_dates[::-1]]),
+        y=np.concatenate([gas_forecast['Upper_CI'].to_numpy(), gas_forecast['Lower_CI'].to_numpy()[::-1]]),
         fill='toself', fillcolor=gas_rgba_colors[gas], line=dict(color='rgba(255,255,255,0)'),
         hoverinfo="skip", name=f'Interval Kepercayaan 95% {gas_name}', showlegend=True, legendgroup=f'group{i}'
-    ), row=row, col=col)
+    ))
+    
+    trace_rows += [row] * 3
+    trace_cols += [col] * 3
+
+fig.add_traces(traces, rows=trace_rows, cols=trace_cols)
 
 # Add logos if available
 images_list = []
@@ -255,8 +587,11 @@ for i, gas in enumerate(target_gases):
 
 # Save to HTML
 output_html_path = "index.html"
+# Load plotly.js from the CDN instead of inlining ~3.5 MB into the file; the
+# figure was built through the validated API, so skip re-validating it on write
 fig.write_html(
     output_html_path,
+    include_plotlyjs='cdn', full_html=True, validate=False,
     config={'locale': 'id', 'displayModeBar': True, 'modeBarButtonsToRemove': ['pan2d', 'select2d', 'lasso2d'], 'displaylogo': False}
 )
 